@@ -6,30 +6,332 @@ Flask web app for converting fixed-width ASCII files to CSV.
 """
 
 from flask import Flask, render_template, request, send_file, jsonify
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 import os
+import csv
+import functools
+import hashlib
 import json
+import re
+import secrets
+import shutil
 import tempfile
-from datetime import datetime
+import threading
+import time
+from operator import itemgetter
 import logging
 
-from fixed_width_to_csv import FixedWidthParser, save_to_csv, load_schema
+from fixed_width_to_csv import FixedWidthParser, IO_BUFFER_SIZE
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider using orjson's C encoder/decoder for API payloads."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
+
+
+def _default_upload_folder(max_upload_size):
+    """
+    Pick the folder for transient uploads and converted CSVs.
+    
+    Uses $UPLOAD_FOLDER if set, otherwise a RAM-backed tmpfs (/dev/shm)
+    when it has room for an upload plus its CSV, otherwise a folder in
+    the system temp directory.
+    """
+    folder = os.environ.get('UPLOAD_FOLDER')
+    if folder:
+        return folder
+    
+    try:
+        if shutil.disk_usage('/dev/shm').free >= 2 * max_upload_size:
+            return os.path.join('/dev/shm', 'taxroll')
+    except OSError:
+        pass
+    return os.path.join(tempfile.gettempdir(), 'taxroll')
+
 
 # Configure Flask app
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max upload
-app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
+app.config['UPLOAD_FOLDER'] = _default_upload_folder(app.config['MAX_CONTENT_LENGTH'])
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Disk-backed folder used instead when UPLOAD_FOLDER runs short of space
+app.config['SPILL_FOLDER'] = os.path.join(tempfile.gettempdir(), 'taxroll')
+# Let nginx/apache stream downloads via sendfile(2); only enable behind a
+# reverse proxy configured for X-Sendfile
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '0') == '1'
+
+# Serve jsonify()/request.json through orjson when it is installed
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Compress API/page responses over 1KB (zstd if the client accepts it,
+# else gzip); CSV downloads are left alone so they can use sendfile
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_ALGORITHM'] = ['zstd', 'gzip']
+if Compress is not None:
+    Compress(app)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-ALLOWED_EXTENSIONS = {'txt', 'csv', 'dat', 'asc'}
+ALLOWED_EXTENSIONS = frozenset({'txt', 'csv', 'dat', 'asc'})
+
+# "<start>-<end> <name>" anywhere on a line of a layout specification
+LAYOUT_LINE_RE = re.compile(r'^.*?(\d+)-(\d+)[^\S\n]+(.+)$', re.MULTILINE)
+
+# Preview reads one head chunk and shows its first few lines
+PREVIEW_READ_SIZE = 16 * 1024
+PREVIEW_LINES = 10
+
+# Part of the conversion cache key; bump whenever the CSV output changes
+# so conversions cached by an older version aren't served
+CONVERSION_CACHE_VERSION = 4
+
+# Stored uploads and CSVs older than this many seconds are deleted, along
+# with cached conversions (0 keeps them forever)
+TRANSIENT_FILE_MAX_AGE = int(os.environ.get('TRANSIENT_FILE_MAX_AGE', 3600))
+PRUNE_INTERVAL_SECONDS = 60
+
+# Names of files this app stores: the 'YYYYmmdd_HHMMSS-<random>_'
+# upload/CSV prefix, or a temp file left by an interrupted write
+TRANSIENT_NAME_RE = re.compile(r'^\d{8}_\d{6}(-[0-9a-f]+)?_|\.tmp$')
+
+# Fixed error payloads, encoded once at import time
+_ERR_NO_FILE = json.dumps({'error': 'No file provided'}).encode('utf-8')
+_ERR_NO_FILE_SELECTED = json.dumps({'error': 'No file selected'}).encode('utf-8')
+_ERR_INVALID_FILE_TYPE = json.dumps({'error': 'Invalid file type'}).encode('utf-8')
+_ERR_NO_SCHEMA = json.dumps({'error': 'No schema provided'}).encode('utf-8')
+_ERR_INVALID_SCHEMA_JSON = json.dumps({'error': 'Invalid schema JSON'}).encode('utf-8')
+_ERR_FILE_NOT_FOUND = json.dumps({'error': 'File not found'}).encode('utf-8')
+_INVALID_NO_SCHEMA = json.dumps({'valid': False, 'error': 'No schema provided'}).encode('utf-8')
+_INVALID_NOT_ARRAY = json.dumps({'valid': False, 'error': 'Schema must be a JSON array'}).encode('utf-8')
+_ERR_NO_LAYOUT_TEXT = json.dumps({'error': 'No layout text provided'}).encode('utf-8')
+_ERR_NO_SCHEMA_EXTRACTED = json.dumps({'error': 'Could not extract schema from text'}).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=32)
+def _get_parser(schema_key):
+    """Build (or reuse) a parser for a canonical schema JSON string."""
+    return FixedWidthParser(json.loads(schema_key))
+
+
+def _canned_response(body, status=200):
+    """Wrap a pre-encoded JSON payload in a fresh response."""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+def _cache_paths(folder, cache_key):
+    """Return the (csv, metadata) paths of a cached conversion in folder."""
+    base = os.path.join(folder, 'cache', cache_key)
+    return base + '.csv', base + '.json'
+
+
+def _transient_folders():
+    """Folders that may hold uploads, CSVs and cached conversions."""
+    folders = [app.config['UPLOAD_FOLDER']]
+    if app.config['SPILL_FOLDER'] != folders[0]:
+        folders.append(app.config['SPILL_FOLDER'])
+    return folders
+
+
+_prune_lock = threading.Lock()
+_next_prune = 0.0
+
+
+def _prune_transient_files(force=False):
+    """
+    Delete stored files older than TRANSIENT_FILE_MAX_AGE.
+    
+    Runs at most once every PRUNE_INTERVAL_SECONDS unless force is set,
+    and is skipped while another thread is already pruning.
+    """
+    global _next_prune
+    
+    now = time.time()
+    if TRANSIENT_FILE_MAX_AGE <= 0 or (not force and now < _next_prune):
+        return
+    if not _prune_lock.acquire(blocking=False):
+        return
+    
+    try:
+        _next_prune = now + PRUNE_INTERVAL_SECONDS
+        cutoff = now - TRANSIENT_FILE_MAX_AGE
+        removed = 0
+        for folder in _transient_folders():
+            # Everything in the cache folder is ours; elsewhere only files
+            # named like the ones convert_file() writes
+            for directory, match in ((folder, TRANSIENT_NAME_RE.search),
+                                     (os.path.join(folder, 'cache'), None)):
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if match is not None and not match(entry.name):
+                                continue
+                            try:
+                                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                                    os.unlink(entry.path)
+                                    removed += 1
+                            except OSError:
+                                pass
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"Pruned {removed} stored files older than {TRANSIENT_FILE_MAX_AGE}s")
+    finally:
+        _prune_lock.release()
+
+
+def _free_space(folder):
+    """Free bytes on folder's filesystem, or 0 if it can't be read."""
+    try:
+        return shutil.disk_usage(folder).free
+    except OSError:
+        return 0
+
+
+def _storage_folder(upload_size):
+    """
+    Choose where to store an upload of upload_size bytes and its CSV.
+    
+    Prefers UPLOAD_FOLDER (usually a RAM-backed tmpfs). If it lacks room
+    for the upload plus its CSV even after pruning, spills to the
+    disk-backed SPILL_FOLDER so the tmpfs can't fill up and take memory
+    from the workers.
+    """
+    folder = app.config['UPLOAD_FOLDER']
+    spill = app.config['SPILL_FOLDER']
+    needed = 2 * upload_size
+    if folder == spill or _free_space(folder) >= needed:
+        return folder
+    
+    _prune_transient_files(force=True)
+    if _free_space(folder) >= needed:
+        return folder
+    
+    logger.warning(f"{folder} is low on space; storing upload in {spill}")
+    os.makedirs(spill, exist_ok=True)
+    return spill
+
+
+def _temp_path(dst):
+    """Create an empty, uniquely named temp file next to dst and return its path."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dst), suffix='.tmp')
+    os.close(fd)
+    # mkstemp creates files 0600; keep CSVs readable by a proxy serving
+    # them through X-Sendfile
+    os.chmod(tmp_path, 0o644)
+    return tmp_path
+
+
+def _remove_quietly(path):
+    """Delete path if it still exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _link_or_copy(src, dst):
+    """Atomically hard-link src to dst, copying when the filesystem can't link."""
+    try:
+        if os.path.samefile(src, dst):
+            return
+    except FileNotFoundError:
+        pass
+    
+    tmp_path = _temp_path(dst)
+    try:
+        # os.link() won't overwrite, so free the reserved name first
+        os.unlink(tmp_path)
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        _remove_quietly(tmp_path)
+
+
+def _cache_lookup(folder, cache_key, output_path):
+    """
+    Reuse a cached conversion for this upload/schema hash.
+    
+    Returns:
+        Record count if the cached CSV was placed at output_path, else None
+    """
+    csv_path, meta_path = _cache_paths(folder, cache_key)
+    try:
+        with open(meta_path, 'rb') as f:
+            record_count = app.json.loads(f.read())['record_count']
+        _link_or_copy(csv_path, output_path)
+        # A hard link keeps the cached file's mtime; restart the prune clock
+        # so the new output isn't deleted before it can be downloaded (this
+        # also keeps the reused cache entry alive)
+        os.utime(output_path)
+        os.utime(meta_path)
+    except (OSError, ValueError, KeyError):
+        return None
+    
+    logger.info(f"Reusing cached conversion {cache_key}")
+    return record_count
+
+
+def _cache_store(folder, cache_key, output_path, record_count):
+    """Remember a finished conversion; the metadata file is written last."""
+    csv_path, meta_path = _cache_paths(folder, cache_key)
+    try:
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+        if not os.path.exists(csv_path):
+            _link_or_copy(output_path, csv_path)
+        meta_tmp_path = _temp_path(meta_path)
+        try:
+            with open(meta_tmp_path, 'w') as f:
+                json.dump({'record_count': record_count}, f)
+            os.replace(meta_tmp_path, meta_path)
+        finally:
+            _remove_quietly(meta_tmp_path)
+    except OSError as e:
+        logger.warning(f"Could not cache conversion {cache_key}: {e}")
+
+
+def _strip_timestamp_prefix(filename):
+    """Drop the 'YYYYmmdd_HHMMSS-<random>_' prefix added to stored files, if present."""
+    i = -1
+    for _ in range(2):
+        i = filename.find('_', i + 1)
+        if i < 0:
+            return filename
+    return filename[i + 1:]
 
 
 def allowed_file(filename):
     """Check if uploaded file type is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
 
 
 @app.route('/')
@@ -107,48 +409,85 @@ def convert_file():
     try:
         # Check for file
         if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+            return _canned_response(_ERR_NO_FILE, 400)
         
         file = request.files['file']
         if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+            return _canned_response(_ERR_NO_FILE_SELECTED, 400)
         
         if not allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type'}), 400
+            return _canned_response(_ERR_INVALID_FILE_TYPE, 400)
         
         # Get schema
         schema_data = request.form.get('schema')
         if not schema_data:
-            return jsonify({'error': 'No schema provided'}), 400
+            return _canned_response(_ERR_NO_SCHEMA, 400)
         
         try:
-            schema = json.loads(schema_data)
+            schema = app.json.loads(schema_data)
         except json.JSONDecodeError:
-            return jsonify({'error': 'Invalid schema JSON'}), 400
+            return _canned_response(_ERR_INVALID_SCHEMA_JSON, 400)
         
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        input_path = os.path.join(app.config['UPLOAD_FOLDER'], timestamp + filename)
-        file.save(input_path)
+        schema_key = json.dumps(schema, sort_keys=True, separators=(',', ':'))
         
-        # Convert
-        parser = FixedWidthParser(schema)
-        records = parser.parse_file(input_path)
+        _prune_transient_files()
+        folder = _storage_folder(request.content_length or app.config['MAX_CONTENT_LENGTH'])
+        
+        # Save uploaded file, hashing it together with the schema so a
+        # repeated upload can reuse its earlier conversion
+        filename = secure_filename(file.filename)
+        # One prefix shared by the upload and its CSV output; the random
+        # part keeps concurrent uploads of the same name in the same second
+        # from overwriting each other, and 'x' mode guarantees it
+        while True:
+            timestamp = f"{time.strftime('%Y%m%d_%H%M%S')}-{secrets.token_hex(4)}_"
+            input_path = os.path.join(folder, timestamp + filename)
+            try:
+                out = open(input_path, 'xb', buffering=0)
+                break
+            except FileExistsError:
+                continue
+        digest = hashlib.blake2b(f"{CONVERSION_CACHE_VERSION}\0{schema_key}\0".encode('utf-8'),
+                                 digest_size=16)
+        with out:
+            for chunk in iter(lambda: file.stream.read(IO_BUFFER_SIZE), b''):
+                digest.update(chunk)
+                out.write(chunk)
+        cache_key = digest.hexdigest()
         
-        # Save output
         output_filename = os.path.splitext(filename)[0] + '.csv'
-        output_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        output_path = os.path.join(app.config['UPLOAD_FOLDER'], output_timestamp + output_filename)
+        output_path = os.path.join(folder, timestamp + output_filename)
         
-        save_to_csv(records, output_path)
+        record_count = _cache_lookup(folder, cache_key, output_path)
+        if record_count is None:
+            # Convert, streaming parsed records straight into the CSV so only
+            # one record is held in memory at a time
+            parser = _get_parser(schema_key)
+            
+            # Write to a temporary name first: output_path may be a hard
+            # link into the cache that must not be truncated in place
+            record_count = 0
+            tmp_path = _temp_path(output_path)
+            try:
+                with open(tmp_path, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+                    csv.writer(f).writerow(parser.header)
+                    write = f.write
+                    format_row = parser.format_csv_row
+                    for row in parser.iter_rows(input_path):
+                        write(format_row(row))
+                        record_count += 1
+                os.replace(tmp_path, output_path)
+            finally:
+                _remove_quietly(tmp_path)
+            
+            _cache_store(folder, cache_key, output_path, record_count)
         
         # Return download link
         return jsonify({
             'success': True,
-            'message': f'Successfully converted {len(records)} records',
-            'record_count': len(records),
-            'output_file': output_timestamp + output_filename,
+            'message': f'Successfully converted {record_count} records',
+            'record_count': record_count,
+            'output_file': timestamp + output_filename,
             'output_path': output_path
         })
         
@@ -161,16 +500,20 @@ def convert_file():
 def download_file(filename):
     """Download converted CSV file."""
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Security check
-        if not os.path.exists(filepath):
-            return jsonify({'error': 'File not found'}), 404
+        # Security check; the CSV may have spilled to disk (see _storage_folder)
+        for folder in _transient_folders():
+            filepath = os.path.join(folder, filename)
+            if os.path.exists(filepath):
+                break
+        else:
+            return _canned_response(_ERR_FILE_NOT_FOUND, 404)
         
         return send_file(
             filepath,
             as_attachment=True,
-            download_name=filename.split('_', 3)[3] if '_' in filename else filename
+            conditional=True,
+            etag=True,
+            download_name=_strip_timestamp_prefix(filename)
         )
     except Exception as e:
         logger.error(f"Download error: {e}")
@@ -183,38 +526,37 @@ def validate_schema():
     try:
         schema_data = request.json.get('schema')
         if not schema_data:
-            return jsonify({'valid': False, 'error': 'No schema provided'})
+            return _canned_response(_INVALID_NO_SCHEMA)
         
-        schema = json.loads(schema_data) if isinstance(schema_data, str) else schema_data
+        schema = app.json.loads(schema_data) if isinstance(schema_data, str) else schema_data
         
         # Basic validation
         if not isinstance(schema, list):
-            return jsonify({'valid': False, 'error': 'Schema must be a JSON array'})
+            return _canned_response(_INVALID_NOT_ARRAY)
         
-        required_keys = {'name', 'start', 'length'}
+        spans = []
         for i, col in enumerate(schema):
             if not isinstance(col, dict):
                 return jsonify({'valid': False, 'error': f'Column {i} is not a dict'})
             
-            if not required_keys.issubset(col.keys()):
-                return jsonify({'valid': False, 'error': f'Column {i} missing required keys: {required_keys}'})
+            if not ('name' in col and 'start' in col and 'length' in col):
+                return jsonify({'valid': False, 'error': f'Column {i} missing required keys: name, start, length'})
             
             if not isinstance(col['start'], int) or col['start'] < 0:
                 return jsonify({'valid': False, 'error': f'Column {i} has invalid start position'})
             
             if not isinstance(col['length'], int) or col['length'] <= 0:
                 return jsonify({'valid': False, 'error': f'Column {i} has invalid length'})
-        
-        # Check for overlaps
-        columns_sorted = sorted(schema, key=lambda x: x['start'])
-        for i in range(len(columns_sorted) - 1):
-            curr_end = columns_sorted[i]['start'] + columns_sorted[i]['length']
-            next_start = columns_sorted[i + 1]['start']
             
+            spans.append((col['start'], col['start'] + col['length'], col['name']))
+        
+        # Check for overlaps on (start, end, name) tuples sorted by start
+        spans.sort(key=itemgetter(0))
+        for (_, curr_end, curr_name), (next_start, _, next_name) in zip(spans, spans[1:]):
             if curr_end > next_start:
                 return jsonify({
                     'valid': False,
-                    'error': f"Columns '{columns_sorted[i]['name']}' and '{columns_sorted[i+1]['name']}' overlap"
+                    'error': f"Columns '{curr_name}' and '{next_name}' overlap"
                 })
         
         return jsonify({'valid': True, 'message': 'Schema is valid', 'field_count': len(schema)})
@@ -230,16 +572,18 @@ def preview_file():
     """Preview first few lines of uploaded file."""
     try:
         if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+            return _canned_response(_ERR_NO_FILE, 400)
         
         file = request.files['file']
-        lines = []
         
-        # Read first 10 lines
-        for i, line in enumerate(file.stream):
-            if i >= 10:
-                break
-            lines.append(line.decode('utf-8', errors='ignore').rstrip())
+        # Read first 10 lines from a single head chunk
+        head = file.stream.read(PREVIEW_READ_SIZE)
+        lines = head.decode('utf-8', errors='ignore').splitlines()[:PREVIEW_LINES + 1]
+        
+        # Drop a trailing line cut off by the read limit
+        if len(head) == PREVIEW_READ_SIZE and len(lines) > 1 and not head.endswith(b'\n'):
+            lines.pop()
+        lines = [line.rstrip() for line in lines[:PREVIEW_LINES]]
         
         return jsonify({
             'success': True,
@@ -260,34 +604,27 @@ def extract_schema():
         layout_text = request.json.get('layout_text', '')
         
         if not layout_text:
-            return jsonify({'error': 'No layout text provided'}), 400
+            return _canned_response(_ERR_NO_LAYOUT_TEXT, 400)
         
         # Simple extraction - looks for patterns like "Position 1-20"
-        import re
-        
         schema = []
-        lines = layout_text.strip().split('\n')
-        
-        for line in lines:
-            # Try to extract position, name, length pattern
-            match = re.search(r'(\d+)-(\d+)\s+(.+)', line)
-            if match:
-                start = int(match.group(1)) - 1  # Convert to 0-based
-                end = int(match.group(2))
-                name = match.group(3).strip()
-                
-                schema.append({
-                    'name': name.replace(' ', '_'),
-                    'start': start,
-                    'length': end - start,
-                    'type': 'str',
-                    'trim': True
-                })
+        for match in LAYOUT_LINE_RE.finditer(layout_text):
+            start = int(match.group(1)) - 1  # Convert to 0-based
+            end = int(match.group(2))
+            name = match.group(3).strip()
+            
+            schema.append({
+                'name': name.replace(' ', '_'),
+                'start': start,
+                'length': end - start,
+                'type': 'str',
+                'trim': True
+            })
         
         if schema:
             return jsonify({'success': True, 'schema': schema})
         else:
-            return jsonify({'error': 'Could not extract schema from text'}), 400
+            return _canned_response(_ERR_NO_SCHEMA_EXTRACTED, 400)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -295,7 +632,6 @@ def extract_schema():
 
 if __name__ == '__main__':
     # Use PORT env var if provided (e.g. Render, Heroku)
-    import os
     port = int(os.environ.get('PORT', 5000))
     # Disable debug when running in production environment
     debug_mode = os.environ.get('FLASK_DEBUG', '0') == '1'
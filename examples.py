@@ -6,7 +6,9 @@ This file demonstrates practical ways to use the converter
 in different scenarios.
 """
 
-from fixed_width_to_csv import FixedWidthParser, save_to_csv, load_schema
+from fixed_width_to_csv import FixedWidthParser, save_to_csv, save_columns_to_csv, load_schema
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import json
 
 
@@ -57,20 +59,21 @@ def example_2_programmatic_usage():
     # Create parser with inline schema
     parser = FixedWidthParser(schema)
     
-    # Parse the file
-    records = parser.parse_file('input_file.txt')
+    # Parse the file into a column-oriented DataFrame (requires pandas)
+    import numpy as np
+    
+    df = parser.parse_file_to_dataframe('input_file.txt')
     
     # Custom filtering - only records with tax amount > 1000
-    filtered = [r for r in records if r['Tax_Amount'] and r['Tax_Amount'] > 1000]
+    filtered = df[df['Tax_Amount'] > 1000].copy()
     
     # Custom transformation - add computed fields
-    for record in filtered:
-        record['Tax_Category'] = 'High' if record['Tax_Amount'] > 5000 else 'Medium'
+    filtered['Tax_Category'] = np.where(filtered['Tax_Amount'] > 5000, 'High', 'Medium')
     
     # Save filtered results
-    save_to_csv(filtered, 'filtered_output.csv')
+    filtered.to_csv('filtered_output.csv', index=False)
     
-    print(f"✓ Processed {len(records)} records")
+    print(f"✓ Processed {len(df)} records")
     print(f"✓ Kept {len(filtered)} records with tax > 1000\n")
 
 
@@ -78,6 +81,13 @@ def example_2_programmatic_usage():
 # Example 3: Processing Multiple Files
 # =============================================================================
 
+def _convert_one(parser, input_file, output_file):
+    """Convert a single file; runs in a worker process for example 3."""
+    records = parser.parse_file(input_file)
+    save_to_csv(records, output_file)
+    return len(records)
+
+
 def example_3_batch_processing():
     """
     Convert multiple tax roll files in a batch.
@@ -98,17 +108,22 @@ def example_3_batch_processing():
     schema = load_schema('schema.json')
     parser = FixedWidthParser(schema)
     
-    # Process each file
-    results = {}
+    # Collect the files that exist
+    pending = []
     for input_file, output_file in file_pairs:
         if Path(input_file).exists():
             print(f"  Processing: {input_file}")
-            records = parser.parse_file(input_file)
-            save_to_csv(records, output_file)
-            results[input_file] = len(records)
+            pending.append((input_file, output_file))
         else:
             print(f"  Skipping: {input_file} (not found)")
     
+    # Files are independent, so convert them in parallel worker processes
+    inputs = [input_file for input_file, _ in pending]
+    outputs = [output_file for _, output_file in pending]
+    with ProcessPoolExecutor() as executor:
+        counts = executor.map(_convert_one, repeat(parser), inputs, outputs)
+        results = dict(zip(inputs, counts))
+    
     # Summary
     print("\nConversion Summary:")
     for file, count in results.items():
@@ -129,11 +144,10 @@ def example_4_validation_and_cleanup():
     
     schema = load_schema('schema.json')
     parser = FixedWidthParser(schema)
-    records = parser.parse_file('input.txt')
     
     # Quality metrics
     stats = {
-        'total': len(records),
+        'total': 0,
         'with_null_parcel': 0,
         'with_null_owner': 0,
         'invalid_tax_amount': 0,
@@ -142,7 +156,10 @@ def example_4_validation_and_cleanup():
     
     cleaned_records = []
     
-    for record in records:
+    # Validate records as they are parsed - a single pass over the file
+    for record in parser.iter_file('input.txt'):
+        stats['total'] += 1
+        
         # Check for required fields
         if not record.get('Parcel_Number', '').strip():
             stats['with_null_parcel'] += 1
@@ -196,29 +213,33 @@ def example_5_delinquent_processing():
     ]
     
     parser = FixedWidthParser(delinquent_schema)
-    records = parser.parse_file('delinquent_roll.txt')
     
-    # Add computed fields for delinquency analysis
-    for record in records:
-        total = (record.get('Current_Tax_Due', 0) or 0) + \
-                (record.get('Prior_Years_Due', 0) or 0) + \
-                (record.get('Penalties_Interest', 0) or 0)
-        
-        record['Total_Amount'] = total
-        
-        # Classify by severity
-        if total > 10000:
-            record['Severity'] = 'High'
-        elif total > 5000:
-            record['Severity'] = 'Medium'
-        else:
-            record['Severity'] = 'Low'
+    # Parse into typed columns (requires numpy), then derive the new fields
+    # for every record in one vectorized pass instead of a per-record loop
+    import numpy as np
+    
+    columns, nulls = parser.parse_file_columnar('delinquent_roll.txt')
+    
+    # Blank amounts are stored as NaN and count as 0
+    total = sum(np.nan_to_num(np.asarray(columns[name], dtype=np.float64))
+                for name in ('Current_Tax_Due', 'Prior_Years_Due', 'Penalties_Interest'))
+    
+    # Classify by severity
+    severity = np.select([total > 10000, total > 5000], ['High', 'Medium'], default='Low')
     
-    # Filter and save high-priority delinquencies
-    high_priority = [r for r in records if r['Severity'] == 'High']
+    # Keep the high-priority rows of every column, with blanks still masked
+    high = total > 10000
+    high_priority = {}
+    for name, column in columns.items():
+        column = np.asarray(column)
+        if name in nulls:
+            column = np.ma.masked_array(column, mask=np.frombuffer(nulls[name], dtype=bool))
+        high_priority[name] = column[high]
+    high_priority['Total_Amount'] = total[high]
+    high_priority['Severity'] = severity[high]
     
-    save_to_csv(high_priority, 'delinquent_high_priority.csv')
-    print(f"✓ Found {len(high_priority)} high-priority delinquencies\n")
+    count = save_columns_to_csv(high_priority, 'delinquent_high_priority.csv')
+    print(f"✓ Found {count} high-priority delinquencies\n")
 
 
 # =============================================================================
@@ -4,17 +4,33 @@ Fixed-Width ASCII Tax Roll to CSV Converter
 Converts fixed-width ASCII format tax roll data into clean CSV files.
 
 Usage:
-    python fixed_width_to_csv.py <input_file> <output_file> [--schema schema.json]
+    python fixed_width_to_csv.py <input_file> <output_file> [--schema schema.json] [--columnar] [--workers N]
 """
 
 import csv
+import io
 import json
 import argparse
+import math
+import os
+import shutil
 import sys
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from itertools import chain, islice
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Optional, Union, BinaryIO, TextIO, Callable
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +38,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Read/write buffer size for large sequential tax-roll files
+IO_BUFFER_SIZE = 1024 * 1024
+
+# Progress is logged at most this often while parsing; the clock is only
+# read every PROGRESS_CHECK_LINES lines to keep it out of the hot loop
+PROGRESS_LOG_SECONDS = 5.0
+PROGRESS_CHECK_LINES = 10000
+
+# Rows transposed at a time by parse_file_columnar()
+COLUMNAR_BATCH_ROWS = 10000
+
+# Placeholder stored in array('q') columns for blank values (see null masks)
+INT64_MIN = -2 ** 63
+
+# Column type codes used by the precompiled schema
+TYPE_STR, TYPE_INT, TYPE_FLOAT, TYPE_DATE = range(4)
+_TYPE_CODES = {'str': TYPE_STR, 'int': TYPE_INT, 'float': TYPE_FLOAT, 'date': TYPE_DATE}
+
 
 class FixedWidthParser:
     """Parse fixed-width ASCII files based on column definitions."""
@@ -40,6 +74,55 @@ class FixedWidthParser:
         """
         self.schema = schema
         self._validate_schema()
+        self._compile_schema()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The compiled extractor and row formatter can't be pickled, so
+        # only the schema crosses to worker processes
+        return {'schema': self.schema}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.schema = state['schema']
+        self._compile_schema()
+    
+    def _compile_schema(self) -> None:
+        """Build the per-line parsing state from the validated schema."""
+        # Precompile the schema into flat (name, start, end, type, trim)
+        # tuples so parse_line doesn't repeat dict lookups for every field
+        self._cols = tuple(
+            (
+                col['name'],
+                col['start'],
+                col['start'] + col['length'],
+                _TYPE_CODES.get(col.get('type', 'str').lower(), TYPE_STR),
+                col.get('trim', True),
+            )
+            for col in self.schema
+        )
+        self._names = tuple(col[0] for col in self._cols)
+        
+        # Pull every field out of a line in one C-level itemgetter call;
+        # parse_line_tuple then only touches the columns needing more work.
+        # (A struct.Struct unpack_from over the encoded line was measured as
+        # well; the encode and per-field decode make it slower than slicing
+        # the already-decoded str.)
+        slices = [slice(start, end) for _, start, end, _, _ in self._cols]
+        if len(slices) > 1:
+            self._extract = itemgetter(*slices)
+        else:
+            self._extract = lambda line: tuple(line[s] for s in slices)
+        self._raw_cols = tuple(
+            i for i, (_, _, _, col_type, trim) in enumerate(self._cols)
+            if col_type == TYPE_STR and not trim
+        )
+        self._num_cols = tuple(
+            (i, name, int if col_type == TYPE_INT else float)
+            for i, (name, _, _, col_type, _) in enumerate(self._cols)
+            if col_type in (TYPE_INT, TYPE_FLOAT)
+        )
+        
+        # Renders a parsed row as one CSV line (see _compile_row_formatter)
+        self.format_csv_row = _compile_row_formatter(self._cols)
     
     def _validate_schema(self) -> None:
         """Validate schema definitions."""
@@ -48,82 +131,117 @@ class FixedWidthParser:
                 raise ValueError(f"Column {i} missing required fields: name, start, length")
             if col['start'] < 0 or col['length'] < 0:
                 raise ValueError(f"Column '{col['name']}' has invalid start/length values")
+        
+        # Overlapping fields still parse (each is sliced on its own) but
+        # usually mean a mistyped layout, so warn instead of failing
+        furthest_end, furthest_name = 0, None
+        for col in sorted(self.schema, key=itemgetter('start')):
+            if col['length'] and col['start'] < furthest_end:
+                logger.warning(f"Columns '{furthest_name}' and '{col['name']}' overlap")
+            end = col['start'] + col['length']
+            if end > furthest_end:
+                furthest_end, furthest_name = end, col['name']
+    
+    @property
+    def header(self) -> List[str]:
+        """Column names in schema order, matching parse_line_tuple()."""
+        return list(self._names)
     
-    def parse_line(self, line: str) -> Dict[str, Any]:
+    def parse_line_tuple(self, line: Union[str, bytes]) -> Tuple[Any, ...]:
         """
-        Extract fields from a fixed-width line.
+        Extract fields from a fixed-width line as a positional row.
         
         Args:
-            line: Single line from fixed-width file
+            line: Single line from fixed-width file (raw bytes are
+                  decoded as UTF-8 first)
             
         Returns:
-            Dictionary with column names as keys and parsed values
+            Tuple of parsed values in schema order (see header)
         """
-        record = {}
-        
-        for col in self.schema:
-            name = col['name']
-            start = col['start']
-            length = col['length']
-            col_type = col.get('type', 'str').lower()
-            trim = col.get('trim', True)
-            
-            # Extract the field value
-            end = start + length
-            value = line[start:end] if start < len(line) else ''
-            
-            # Trim whitespace if requested
-            if trim and col_type == 'str':
-                value = value.strip()
-            
-            # Type conversion
+        if isinstance(line, bytes):
+            # Positions are character offsets, so slice the decoded text
+            line = line.decode('utf-8', 'ignore')
+        fields = self._extract(line)
+        
+        # Trim everything in one pass, then restore untrimmed string columns
+        # (dates and numerics are always compared/converted trimmed)
+        row = list(map(str.strip, fields))
+        for i in self._raw_cols:
+            row[i] = fields[i]
+        
+        # Blank numerics short-circuit to None on the already-trimmed value.
+        # (Memoizing conversions per column was tried and measured slower:
+        # int()/float() on short fields cost about as much as a dict lookup.)
+        for i, name, convert in self._num_cols:
+            value = row[i]
+            if not value:
+                row[i] = None
+                continue
             try:
-                if col_type == 'int':
-                    record[name] = int(value) if value.strip() else None
-                elif col_type == 'float':
-                    record[name] = float(value) if value.strip() else None
-                elif col_type == 'date':
-                    # Keep as string - can be converted to proper date if needed
-                    record[name] = value.strip()
-                else:  # 'str' or default
-                    record[name] = value
+                row[i] = convert(value)
             except ValueError as e:
                 logger.warning(f"Type conversion error for column '{name}': {e}")
-                record[name] = value
         
-        return record
+        return tuple(row)
     
-    def parse_file(self, input_file: str) -> List[Dict[str, Any]]:
+    def parse_line(self, line: Union[str, bytes]) -> Dict[str, Any]:
         """
-        Parse entire fixed-width file.
+        Extract fields from a fixed-width line.
         
         Args:
-            input_file: Path to input file
+            line: Single line from fixed-width file (str or raw bytes)
             
         Returns:
-            List of dictionaries, one per record
+            Dictionary with column names as keys and parsed values
+        """
+        return dict(zip(self._names, self.parse_line_tuple(line)))
+    
+    def _iter_lines(self, input_file: Union[str, BinaryIO, TextIO], start: int = 0,
+                    end: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the non-empty lines of a file without line terminators.
+        
+        input_file may also be an already open stream (e.g. a pipe being
+        filled by a download), which is read as UTF-8 text but not closed.
+        start/end restrict reading to that byte range of a file; both
+        must fall on line boundaries.
         """
-        records = []
+        record_count = 0
+        
+        if isinstance(input_file, (str, os.PathLike)):
+            if start or end is not None:
+                source = _open_byte_range(input_file, start, end)
+            else:
+                source = open(input_file, 'r', encoding='utf-8', errors='ignore',
+                              buffering=IO_BUFFER_SIZE)
+        elif isinstance(input_file, io.TextIOBase):
+            source = nullcontext(input_file)
+        else:
+            source = _text_view(input_file)
+        
+        next_check = PROGRESS_CHECK_LINES
+        next_report = time.monotonic() + PROGRESS_LOG_SECONDS
         
         try:
-            with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
+            with source as f:
                 for line_num, line in enumerate(f, 1):
-                    # Skip empty lines
-                    if not line.strip():
+                    # Skip empty lines (isspace() avoids copying each line
+                    # the way strip() would; iterated lines are never '')
+                    if line.isspace():
                         continue
                     
                     # Remove newline characters
-                    line = line.rstrip('\n\r')
-                    
-                    # Parse the line
-                    record = self.parse_line(line)
-                    records.append(record)
+                    yield line.rstrip('\n\r')
+                    record_count += 1
                     
-                    if line_num % 10000 == 0:
-                        logger.info(f"Processed {line_num} lines...")
+                    if line_num >= next_check:
+                        next_check = line_num + PROGRESS_CHECK_LINES
+                        now = time.monotonic()
+                        if now >= next_report:
+                            next_report = now + PROGRESS_LOG_SECONDS
+                            logger.info(f"Processed {line_num} lines...")
             
-            logger.info(f"Successfully parsed {len(records)} records")
-            return records
+            logger.info(f"Successfully parsed {record_count} records")
         
         except FileNotFoundError:
             logger.error(f"Input file not found: {input_file}")
@@ -131,36 +249,656 @@ class FixedWidthParser:
         except Exception as e:
             logger.error(f"Error parsing file: {e}")
             raise
+    
+    def iter_file(self, input_file: Union[str, BinaryIO]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily parse a fixed-width file, yielding one record at a time.
+        
+        Only the current line is held in memory, so arbitrarily large
+        files can be streamed straight into a CSV writer.
+        
+        Args:
+            input_file: Path to input file, or an open binary stream
+            
+        Yields:
+            Dictionary with column names as keys and parsed values
+        """
+        for line in self._iter_lines(input_file):
+            yield self.parse_line(line)
+    
+    def iter_rows(self, input_file: Union[str, BinaryIO],
+                  where: Optional[Callable[[Tuple[Any, ...]], bool]] = None
+                  ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Lazily parse a fixed-width file into positional rows.
+        
+        Cheaper than iter_file(): no per-record dictionary is built. Pair
+        with header for the column names.
+        
+        Args:
+            input_file: Path to input file, or an open binary stream
+            where: Optional predicate on each row; rows for which it returns
+                   False are dropped as they are parsed
+            
+        Yields:
+            Tuple of parsed values in schema order
+        """
+        rows = map(self.parse_line_tuple, self._iter_lines(input_file))
+        if where is not None:
+            rows = filter(where, rows)
+        yield from rows
+    
+    def parse_file(self, input_file: str) -> List[Dict[str, Any]]:
+        """
+        Parse entire fixed-width file.
+        
+        Args:
+            input_file: Path to input file
+            
+        Returns:
+            List of dictionaries, one per record
+        """
+        return list(self.iter_file(input_file))
+    
+    def parse_file_parallel(self, input_file: str, output_file: str,
+                            workers: Optional[int] = None) -> int:
+        """
+        Convert a fixed-width file to CSV using several processes.
+        
+        The file is split into byte ranges aligned to line boundaries.
+        Each worker process parses one range into its own headerless CSV,
+        and the pieces are then concatenated under a single header.
+        
+        Args:
+            input_file: Path to input file
+            output_file: Path to output CSV file
+            workers: Number of worker processes (default: CPU count)
+            
+        Returns:
+            Number of records written
+        """
+        workers = workers or os.cpu_count() or 1
+        size = os.path.getsize(input_file)
+        
+        # Move each split point forward to the start of the next line
+        bounds = [0]
+        with open(input_file, 'rb') as f:
+            for i in range(1, workers):
+                f.seek(size * i // workers)
+                f.readline()
+                bounds.append(max(f.tell(), bounds[-1]))
+        bounds.append(size)
+        ranges = [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+        
+        logger.info(f"Parsing {input_file} in {len(ranges)} chunks")
+        
+        # Chunk files go next to the output so the final copy stays on one disk
+        output_dir = os.path.dirname(os.path.abspath(output_file))
+        with tempfile.TemporaryDirectory(dir=output_dir) as chunk_dir:
+            chunk_files = [os.path.join(chunk_dir, f'chunk_{i}.csv') for i in range(len(ranges))]
+            with ProcessPoolExecutor(max_workers=len(ranges) or 1) as executor:
+                counts = list(executor.map(
+                    _parse_chunk_to_csv,
+                    [self.schema] * len(ranges),
+                    [input_file] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                    chunk_files,
+                ))
+            
+            record_count = sum(counts)
+            if not record_count:
+                logger.warning("No records to save")
+                return 0
+            
+            try:
+                with open(output_file, 'w', newline='', encoding='utf-8',
+                          buffering=IO_BUFFER_SIZE) as out:
+                    csv.writer(out).writerow(self.header)
+                    out.flush()
+                    for chunk_file in chunk_files:
+                        with open(chunk_file, 'rb') as chunk:
+                            shutil.copyfileobj(chunk, out.buffer, IO_BUFFER_SIZE)
+            except Exception as e:
+                logger.error(f"Error saving CSV: {e}")
+                raise
+        
+        logger.info(f"CSV successfully saved to: {output_file}")
+        logger.info(f"Total records written: {record_count}")
+        return record_count
+    
+    def parse_file_columnar(self, input_file: Union[str, BinaryIO]
+                            ) -> Tuple[Dict[str, Any], Dict[str, array]]:
+        """
+        Parse a file into typed per-column buffers instead of records.
+        
+        int and float columns accumulate in array('q') / array('d'), 8
+        bytes per value instead of a boxed Python number in a dict; string
+        and date columns accumulate in lists. Blank numerics hold a
+        placeholder (INT64_MIN / NaN) and are flagged in a per-column
+        array('B') null mask. A numeric column that meets an unparseable
+        value becomes a list holding the raw text, as parse_line() returns
+        it, with None for blanks and no mask.
+        
+        Unlike parse_file_numpy() this needs no third-party packages and
+        accepts variable-length records.
+        
+        Args:
+            input_file: Path to input file, or an open binary stream
+            
+        Returns:
+            Tuple of (columns, nulls): column name to buffer in schema
+            order, and column name to null mask (1 = blank) for the
+            array-backed columns
+        """
+        buffers = []
+        for _, _, _, col_type, _ in self._cols:
+            if col_type == TYPE_INT:
+                buffers.append(array('q'))
+            elif col_type == TYPE_FLOAT:
+                buffers.append(array('d'))
+            else:
+                buffers.append([])
+        masks = [array('B') if isinstance(buf, array) else None for buf in buffers]
+        
+        # Transpose the row stream a batch at a time so each column is
+        # extended in one call
+        rows = self.iter_rows(input_file)
+        while True:
+            batch = list(islice(rows, COLUMNAR_BATCH_ROWS))
+            if not batch:
+                break
+            
+            for i, values in enumerate(zip(*batch)):
+                buf = buffers[i]
+                mask = masks[i]
+                if mask is None:
+                    buf.extend(values)
+                    continue
+                
+                filled = len(buf)
+                try:
+                    buf.extend(values)
+                    mask.extend(bytes(len(values)))
+                except (TypeError, OverflowError):
+                    # Blank or unparseable values: redo the batch one by one
+                    del buf[filled:]
+                    buffers[i], masks[i] = _extend_masked(buf, mask, values)
+        
+        columns = dict(zip(self._names, buffers))
+        nulls = {name: mask for name, mask in zip(self._names, masks) if mask is not None}
+        return columns, nulls
+    
+    def parse_file_numpy(self, input_file: str) -> Dict[str, Any]:
+        """
+        Vectorized parse of a file whose records all have the same length.
+        
+        NOTE: Requires 'numpy'. Install with: pip install numpy
+        
+        The whole file is viewed as a (records x record_length) byte
+        matrix and each column is sliced, trimmed and converted as one
+        array instead of field by field. Fields are sliced by byte offset,
+        so only plain ASCII input is accepted, where bytes and characters
+        coincide.
+        
+        Args:
+            input_file: Path to input file
+            
+        Returns:
+            Dictionary mapping column names to NumPy arrays in schema
+            order. Blank int/float fields are masked (numpy.ma); a numeric
+            column with unparseable values becomes an object array holding
+            the raw text, as parse_line() does.
+            
+        Raises:
+            ValueError: If records are not all the same length, or the
+                        file is not plain ASCII
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            logger.error("numpy not installed. Install with: pip install numpy")
+            raise
+        
+        with open(input_file, 'rb') as f:
+            data = f.read()
+        if not data.isascii():
+            raise ValueError(f"{input_file} is not plain ASCII")
+        
+        # Record stride includes the line terminator; supply a missing one
+        # on the last record
+        newline = data.find(b'\n')
+        terminator = b'\r\n' if newline > 0 and data[newline - 1:newline] == b'\r' else b'\n'
+        if data and not data.endswith(b'\n'):
+            data += terminator
+        stride = newline + 1 if newline >= 0 else len(data)
+        record_len = stride - len(terminator)
+        
+        if not data:
+            matrix = np.zeros((0, 0), dtype=np.uint8)
+        else:
+            if len(data) % stride:
+                raise ValueError(f"{input_file} does not have fixed-length records")
+            matrix = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)
+            if not (matrix[:, record_len:] == np.frombuffer(terminator, dtype=np.uint8)).all():
+                raise ValueError(f"{input_file} does not have fixed-length records")
+            # A CR anywhere but in the terminators would end a line early
+            if data.count(b'\r') != (len(matrix) if terminator == b'\r\n' else 0):
+                raise ValueError(f"{input_file} does not have fixed-length records")
+        n_records = matrix.shape[0]
+        
+        columns = {}
+        for name, start, end, col_type, trim in self._cols:
+            start, end = min(start, record_len), min(end, record_len)
+            if end > start:
+                field = np.ascontiguousarray(matrix[:, start:end]).view(f'S{end - start}').ravel()
+            else:
+                field = np.zeros(n_records, dtype='S1')
+            
+            if col_type == TYPE_INT or col_type == TYPE_FLOAT:
+                field = np.char.strip(field)
+                blank = field == b''
+                dtype = np.int64 if col_type == TYPE_INT else np.float64
+                try:
+                    values = np.where(blank, b'0', field).astype(dtype)
+                    columns[name] = np.ma.masked_array(values, mask=blank)
+                except (ValueError, OverflowError) as e:
+                    # Values too wide for int64 still convert to Python
+                    # ints, as in parse_line(); only bad text is an error
+                    if not isinstance(e, OverflowError):
+                        logger.warning(f"Type conversion error for column '{name}': {e}")
+                    convert = int if col_type == TYPE_INT else float
+                    columns[name] = np.array(
+                        [_convert_or_text(convert, value) for value in field.tolist()],
+                        dtype=object
+                    )
+            else:
+                if trim or col_type == TYPE_DATE:
+                    field = np.char.strip(field)
+                columns[name] = field.astype(str)
+        
+        logger.info(f"Successfully parsed {n_records} records")
+        return columns
+    
+    def parse_file_to_dataframe(self, input_file: str):
+        """
+        Parse a fixed-width file into a column-oriented pandas DataFrame.
+        
+        NOTE: Requires 'pandas'. Install with: pip install pandas
+        
+        Numeric columns are stored as contiguous nullable Int64/float64
+        arrays, so filters and computed fields can be vectorized instead
+        of looping over record dictionaries. The file is read through
+        parse_file_columnar(), so no per-record objects are built on the
+        way either.
+        
+        Args:
+            input_file: Path to input file
+            
+        Returns:
+            pandas.DataFrame with one column per schema field
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            logger.error("pandas not installed. Install with: pip install pandas")
+            raise
+        
+        import numpy as np
+        
+        columns, nulls = self.parse_file_columnar(input_file)
+        
+        data = {}
+        for name, column in columns.items():
+            mask = nulls.get(name)
+            if mask is None:
+                data[name] = column
+            elif column.typecode == 'q':
+                values = np.frombuffer(column, dtype=np.int64).copy()
+                data[name] = pd.arrays.IntegerArray(values, np.frombuffer(mask, dtype=bool).copy())
+            else:
+                # Blank floats already hold NaN
+                data[name] = np.frombuffer(column, dtype=np.float64).copy()
+        df = pd.DataFrame(data, columns=list(columns))
+        
+        # Numeric columns that kept raw text for unparseable values
+        for name, _, _, col_type, _ in self._cols:
+            if name in nulls:
+                continue
+            if col_type == TYPE_INT:
+                df[name] = pd.to_numeric(df[name], errors='coerce').astype('Int64')
+            elif col_type == TYPE_FLOAT:
+                df[name] = pd.to_numeric(df[name], errors='coerce').astype('float64')
+        
+        return df
+
+
+def _compile_row_formatter(cols: Tuple[Tuple[str, int, int, int, bool], ...]
+                           ) -> Callable[[Tuple[Any, ...]], str]:
+    """
+    Generate a function rendering one parsed row as a CSV line.
+    
+    The column types are fixed by the schema, so rather than having
+    csv.writer inspect every cell, numeric columns are written bare and
+    only text and date values are checked (with inline 'in' tests) for
+    the commas, quotes or newlines that make them need quoting, all in one
+    %-format. Numeric cells that failed conversion still hold their raw
+    text and are checked like text. The output is identical to
+    csv.writer's, including its '\r\n' line endings.
+    
+    Args:
+        cols: Precompiled schema, as FixedWidthParser._cols
+        
+    Returns:
+        Function taking a row tuple and returning the CSV line
+    """
+    # csv.writer quotes a lone empty field, or the line would read back
+    # as blank
+    alone = len(cols) == 1
+    empty = '""' if alone else ''
+    
+    args = []
+    for i, (_, _, _, col_type, _) in enumerate(cols):
+        value = f"r[{i}]"
+        special = f"',' in {value} or '\"' in {value} or '\\n' in {value} or '\\r' in {value}"
+        if alone:
+            special = f"not {value} or {special}"
+        text = f"(_quote({value}) if {special} else {value})"
+        if col_type in (TYPE_INT, TYPE_FLOAT):
+            args.append(f"{empty!r} if {value} is None else {text} "
+                        f"if {value}.__class__ is str else {value}")
+        else:
+            args.append(text)
+    
+    template = ','.join(['%s'] * len(cols)) + '\r\n'
+    values = ''.join(f"{arg}, " for arg in args)
+    source = f"def format_csv_row(r):\n    return {template!r} % ({values})\n"
+    namespace = {'_quote': _quote_csv}
+    exec(source, namespace)
+    return namespace['format_csv_row']
+
 
+def _quote_csv(value: str) -> str:
+    """Quote a CSV field, doubling embedded quotes."""
+    return '"' + value.replace('"', '""') + '"'
 
-def save_to_csv(records: List[Dict[str, Any]], output_file: str) -> None:
+
+def _extend_masked(buf: array, mask: array, values: Tuple[Any, ...]
+                   ) -> Tuple[Any, Optional[array]]:
+    """
+    Append values to a typed column buffer and its null mask.
+    
+    Returns:
+        The (buffer, mask) to keep using: the same pair, or a plain list
+        and None once a value doesn't fit the array
+    """
+    placeholder = INT64_MIN if buf.typecode == 'q' else math.nan
+    for n, value in enumerate(values):
+        if value is None:
+            buf.append(placeholder)
+            mask.append(1)
+            continue
+        try:
+            buf.append(value)
+        except (TypeError, OverflowError):
+            # Raw text (or an int beyond 64 bits): keep the column as a list
+            column = _masked_to_list(buf, mask)
+            column.extend(values[n:])
+            return column, None
+        mask.append(0)
+    return buf, mask
+
+
+def _masked_to_list(buf: array, mask: array) -> List[Any]:
+    """Python values of a typed column buffer, with None where mask is set."""
+    if not mask.count(1):
+        return buf.tolist()
+    return [None if missing else value for value, missing in zip(buf.tolist(), mask)]
+
+
+def _convert_or_text(convert, value: bytes) -> Any:
+    """Convert a stripped numeric field, keeping its text if it won't parse."""
+    if not value:
+        return None
+    try:
+        return convert(value)
+    except ValueError:
+        return value.decode('utf-8', 'ignore')
+
+
+class _ByteRange(io.RawIOBase):
+    """Unbuffered reader over bytes [start, end) of a file."""
+    
+    def __init__(self, input_file: str, start: int, end: Optional[int]):
+        self._file = open(input_file, 'rb', buffering=0)
+        self._file.seek(start)
+        self._remaining = end - start if end is not None else None
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        if self._remaining is None:
+            return self._file.readinto(buffer)
+        if not self._remaining:
+            return 0
+        n = self._file.readinto(memoryview(buffer)[:self._remaining])
+        self._remaining -= n
+        return n
+    
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _open_byte_range(input_file: str, start: int, end: Optional[int]) -> TextIO:
+    """Open bytes [start, end) of a file as UTF-8 text, like open() would."""
+    raw = io.BufferedReader(_ByteRange(input_file, start, end), IO_BUFFER_SIZE)
+    return io.TextIOWrapper(raw, encoding='utf-8', errors='ignore')
+
+
+@contextmanager
+def _text_view(stream: BinaryIO) -> Iterator[TextIO]:
+    """Read an open binary stream as UTF-8 text without closing it afterwards."""
+    text = io.TextIOWrapper(stream, encoding='utf-8', errors='ignore')
+    try:
+        yield text
+    finally:
+        text.detach()
+
+
+def _parse_chunk_to_csv(schema: List[Dict[str, Any]], input_file: str,
+                        start: int, end: int, chunk_file: str) -> int:
+    """
+    Worker for parse_file_parallel(): parse one byte range to a CSV file.
+    
+    Runs in a child process, so the parser is rebuilt from the schema
+    rather than pickled with its precompiled state.
+    
+    Returns:
+        Number of records written
+    """
+    parser = FixedWidthParser(schema)
+    parse_line_tuple = parser.parse_line_tuple
+    format_row = parser.format_csv_row
+    record_count = 0
+    with open(chunk_file, 'w', newline='', encoding='utf-8',
+              buffering=IO_BUFFER_SIZE) as f:
+        write = f.write
+        for record_count, line in enumerate(parser._iter_lines(input_file, start, end), 1):
+            write(format_row(parse_line_tuple(line)))
+    return record_count
+
+
+def save_to_csv(records: Iterable[Any], output_file: str,
+                header: Optional[List[str]] = None,
+                format_row: Optional[Callable[[Tuple[Any, ...]], str]] = None) -> int:
     """
     Save parsed records to CSV file.
     
+    Records are written as they are consumed, so a generator such as
+    parser.iter_rows() streams straight to disk without being held in
+    memory.
+    
     Args:
-        records: List of record dictionaries
+        records: Iterable of record dictionaries, or of positional rows
+                 (tuples) when header is given
         output_file: Path to output CSV file
+        header: Column names for positional rows (e.g. parser.header)
+        format_row: Optional compiled formatter for positional rows (e.g.
+                    parser.format_csv_row), used instead of csv.writer
+        
+    Returns:
+        Number of records written
     """
-    if not records:
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
         logger.warning("No records to save")
-        return
+        return 0
     
     try:
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = list(records[0].keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+        with open(output_file, 'w', newline='', encoding='utf-8',
+                  buffering=IO_BUFFER_SIZE) as f:
+            if header is not None:
+                writer = csv.writer(f)
+                writer.writerow(header)
+            else:
+                fieldnames = list(first.keys())
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
             
-            writer.writeheader()
-            writer.writerows(records)
+            record_count = 0
+            if header is not None and format_row is not None:
+                write = f.write
+                for record_count, record in enumerate(chain((first,), records), 1):
+                    write(format_row(record))
+            else:
+                writerow = writer.writerow
+                for record_count, record in enumerate(chain((first,), records), 1):
+                    writerow(record)
         
         logger.info(f"CSV successfully saved to: {output_file}")
-        logger.info(f"Total records written: {len(records)}")
+        logger.info(f"Total records written: {record_count}")
+        return record_count
     
     except Exception as e:
         logger.error(f"Error saving CSV: {e}")
         raise
 
 
+def save_columns_to_csv(columns: Dict[str, Any], output_file: str,
+                        nulls: Optional[Dict[str, array]] = None) -> int:
+    """
+    Save column-oriented parse results to CSV.
+    
+    Accepts parse_file_numpy() results, or parse_file_columnar()'s
+    columns together with its null masks.
+    
+    Uses pyarrow's multithreaded C writer when it is installed, otherwise
+    falls back to csv.writer. pyarrow quotes every text field and writes
+    floats in shortest form (12500 rather than 12500.0); both outputs
+    load identically.
+    
+    Args:
+        columns: Mapping of column name to equal-length arrays
+        output_file: Path to output CSV file
+        nulls: Mapping of column name to null mask (1 = blank) for columns
+               whose blanks are stored as placeholders
+        
+    Returns:
+        Number of records written
+    """
+    names = list(columns)
+    record_count = len(columns[names[0]]) if names else 0
+    nulls = nulls or {}
+    
+    try:
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            pa = None
+        
+        if pa is not None:
+            table = pa.table([_to_arrow(pa, col, nulls.get(name))
+                              for name, col in columns.items()], names=names)
+            pacsv.write_csv(table, output_file)
+        else:
+            with open(output_file, 'w', newline='', encoding='utf-8',
+                      buffering=IO_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(names)
+                writer.writerows(zip(*(_to_list(col, nulls.get(name))
+                                       for name, col in columns.items())))
+        
+        logger.info(f"CSV successfully saved to: {output_file}")
+        logger.info(f"Total records written: {record_count}")
+        return record_count
+    
+    except Exception as e:
+        logger.error(f"Error saving CSV: {e}")
+        raise
+
+
+def _to_list(column: Any, null_mask: Optional[array] = None) -> List[Any]:
+    """Python values of a column array, with None for masked entries."""
+    if null_mask is not None:
+        return _masked_to_list(column, null_mask)
+    if isinstance(column, list):
+        return column
+    mask = getattr(column, 'mask', None)
+    if mask is None or not mask.any():
+        return column.tolist()
+    return [None if missing else value
+            for value, missing in zip(column.data.tolist(), mask.tolist())]
+
+
+def _to_arrow(pa, column: Any, null_mask: Optional[array] = None):
+    """Convert a column array to a pyarrow array, keeping masked entries null."""
+    if isinstance(column, array):
+        # Wrap the typed buffer without copying; blanks come from the mask
+        arrow_type = pa.int64() if column.typecode == 'q' else pa.float64()
+        values = pa.Array.from_buffers(arrow_type, len(column), [None, pa.py_buffer(column)])
+        if null_mask is None or not null_mask.count(1):
+            return values
+        import pyarrow.compute as pc
+        blank = pa.Array.from_buffers(pa.uint8(), len(null_mask), [None, pa.py_buffer(null_mask)])
+        return pc.if_else(pc.equal(blank, 0), values, pa.scalar(None, arrow_type))
+    if isinstance(column, list):
+        try:
+            return pa.array(column)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Numeric column holding raw text for values that failed to parse
+            return pa.array([None if value is None else str(value) for value in column],
+                            type=pa.string())
+    if column.dtype == object:
+        # Numeric column holding raw text for values that failed to parse
+        return pa.array([None if value is None else str(value) for value in column.tolist()],
+                        type=pa.string())
+    mask = getattr(column, 'mask', None)
+    if mask is not None:
+        return pa.array(column.data, mask=column.mask if mask.shape else None)
+    return pa.array(column)
+
+
+def load_json(json_file: str) -> Any:
+    """
+    Read a JSON file, using orjson's faster decoder when it is installed.
+    
+    Args:
+        json_file: Path to JSON file (UTF-8)
+        
+    Returns:
+        Decoded JSON value
+    """
+    with open(json_file, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_schema(schema_file: str) -> List[Dict[str, Any]]:
     """
     Load column schema from JSON file.
@@ -172,8 +910,7 @@ def load_schema(schema_file: str) -> List[Dict[str, Any]]:
         List of column definitions
     """
     try:
-        with open(schema_file, 'r') as f:
-            schema = json.load(f)
+        schema = load_json(schema_file)
         logger.info(f"Loaded schema from: {schema_file}")
         return schema
     except FileNotFoundError:
@@ -275,6 +1012,16 @@ def main():
         default='schema.json',
         help='Path to schema JSON file (default: schema.json)'
     )
+    parser.add_argument(
+        '--columnar',
+        action='store_true',
+        help='Vectorized NumPy parse + pyarrow CSV write for fixed-length records'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Parse with this many processes (line-by-line mode only)'
+    )
     parser.add_argument(
         '--create-sample-schema',
         action='store_true',
@@ -295,13 +1042,24 @@ def main():
         # Create parser
         parser_obj = FixedWidthParser(schema)
         
-        # Parse input file
+        # Parse input file and stream rows straight into the CSV
         logger.info(f"Parsing input file: {args.input_file}")
-        records = parser_obj.parse_file(args.input_file)
-        
-        # Save to CSV
         logger.info(f"Saving to CSV: {args.output_file}")
-        save_to_csv(records, args.output_file)
+        columns = None
+        if args.columnar:
+            try:
+                columns = parser_obj.parse_file_numpy(args.input_file)
+            except ValueError as e:
+                logger.warning(f"{e}; falling back to line-by-line parsing")
+        
+        if columns is not None:
+            save_columns_to_csv(columns, args.output_file)
+        elif args.workers and args.workers > 1:
+            parser_obj.parse_file_parallel(args.input_file, args.output_file, args.workers)
+        else:
+            rows = parser_obj.iter_rows(args.input_file)
+            save_to_csv(rows, args.output_file, header=parser_obj.header,
+                        format_row=parser_obj.format_csv_row)
         
         logger.info("Conversion completed successfully!")
         return 0
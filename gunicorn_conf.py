@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for the Tax Roll Converter web app.
+
+Runs several worker processes with a small thread pool each, so a long
+conversion doesn't block other uploads. Keep FLASK_DEBUG unset (or 0) in
+production.
+
+Usage:
+    gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+import os
+
+# Use PORT env var if provided (e.g. Render, Heroku)
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, os.cpu_count() or 1)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+
+# Recycle workers periodically and allow slow multi-hundred-MB conversions
+max_requests = 200
+max_requests_jitter = 20
+timeout = 300
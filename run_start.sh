@@ -10,7 +10,7 @@ pip install -r requirements.txt
 # Prefer gunicorn for production; fall back to built-in server
 if command -v gunicorn >/dev/null 2>&1; then
     echo "Starting with gunicorn"
-    gunicorn app:app --bind 0.0.0.0:${PORT:-5000}
+    gunicorn -c gunicorn_conf.py wsgi:app
 else
     echo "Gunicorn not found, running via python"
     python app.py
@@ -13,15 +13,18 @@ Prerequisites:
 import os
 import json
 import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 
 # Uncomment to enable SFTP support
 # import paramiko
 # from paramiko.ssh_exception import AuthenticationException
 
-from fixed_width_to_csv import FixedWidthParser, save_to_csv, load_schema
+from fixed_width_to_csv import FixedWidthParser, save_to_csv, load_schema, load_json, IO_BUFFER_SIZE
 
 
 # Configure logging
@@ -31,6 +34,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# SSH flow-control window per channel. paramiko's 2 MiB default keeps too
+# few bytes in flight for multi-GB rolls on a high-latency link.
+SFTP_WINDOW_SIZE = 4 * 1024 * 1024
+
 
 class SFTPTaxRollProcessor:
     """
@@ -46,14 +53,27 @@ class SFTPTaxRollProcessor:
         """
         self.config = self._load_config(config_file)
         self.schema = None
+        self._parser = None
+        
+        # SSH transport, opened on first use and shared by later calls and
+        # threads; each thread gets its own SFTPClient channel on top of it
+        self._transport = None
+        self._clients = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def _load_config(self, config_file: str) -> dict:
         """Load SFTP configuration from JSON file."""
         if not Path(config_file).exists():
             raise FileNotFoundError(f"Config file not found: {config_file}")
         
-        with open(config_file, 'r') as f:
-            config = json.load(f)
+        config = load_json(config_file)
         
         required_keys = ['sftp_host', 'sftp_user', 'sftp_password', 'remote_path', 'local_path', 'schema_file']
         if not all(key in config for key in required_keys):
@@ -62,6 +82,84 @@ class SFTPTaxRollProcessor:
         logger.info("Configuration loaded successfully")
         return config
     
+    def _get_parser(self) -> FixedWidthParser:
+        """Load the schema and build its parser once, on first use."""
+        with self._lock:
+            if self._parser is None:
+                self.schema = load_schema(self.config['schema_file'])
+                self._parser = FixedWidthParser(self.schema)
+            return self._parser
+    
+    def _connect(self):
+        """
+        Return this thread's SFTP client, connecting on first use.
+        
+        NOTE: Requires 'paramiko' library. Install with: pip install paramiko
+        
+        All threads share one SSH transport; each opens its own SFTP
+        channel so concurrent downloads don't interleave requests.
+        
+        Returns:
+            Connected paramiko SFTPClient
+        """
+        sftp = getattr(self._local, 'sftp', None)
+        if sftp is not None:
+            return sftp
+        
+        try:
+            import paramiko
+        except ImportError:
+            logger.error("paramiko not installed. Install with: pip install paramiko")
+            raise
+        
+        with self._lock:
+            if self._transport is None or not self._transport.is_active():
+                transport = paramiko.Transport(
+                    (self.config['sftp_host'], 22),
+                    default_window_size=SFTP_WINDOW_SIZE
+                )
+                try:
+                    transport.connect(
+                        username=self.config['sftp_user'],
+                        password=self.config['sftp_password']
+                    )
+                except Exception:
+                    transport.close()
+                    raise
+                
+                self._transport = transport
+                logger.info(f"Connected to {self.config['sftp_host']}")
+            
+            sftp = paramiko.SFTPClient.from_transport(self._transport)
+            self._clients.append(sftp)
+        
+        self._local.sftp = sftp
+        return sftp
+    
+    def _drop_client(self) -> None:
+        """Discard this thread's SFTP client after a failed operation."""
+        sftp = getattr(self._local, 'sftp', None)
+        if sftp is None:
+            return
+        
+        self._local.sftp = None
+        with self._lock:
+            if sftp in self._clients:
+                self._clients.remove(sftp)
+        sftp.close()
+    
+    def close(self) -> None:
+        """Close all SFTP clients and the shared transport."""
+        with self._lock:
+            for sftp in self._clients:
+                sftp.close()
+            self._clients = []
+            self._local = threading.local()
+            
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+    
     def download_file(self, remote_filename: str) -> Optional[str]:
         """
         Download file from SFTP server.
@@ -74,12 +172,6 @@ class SFTPTaxRollProcessor:
         Returns:
             Local path to downloaded file, or None if failed
         """
-        try:
-            import paramiko
-        except ImportError:
-            logger.error("paramiko not installed. Install with: pip install paramiko")
-            return None
-        
         local_path = Path(self.config['local_path'])
         local_path.mkdir(parents=True, exist_ok=True)
         
@@ -87,27 +179,22 @@ class SFTPTaxRollProcessor:
         remote_file = f"{self.config['remote_path'].rstrip('/')}/{remote_filename}"
         
         try:
-            # Create SFTP connection
-            transport = paramiko.Transport((self.config['sftp_host'], 22))
-            transport.connect(
-                username=self.config['sftp_user'],
-                password=self.config['sftp_password']
-            )
-            
-            sftp = paramiko.SFTPClient.from_transport(transport)
+            sftp = self._connect()
             
             # Download file
             logger.info(f"Downloading {remote_file}...")
-            sftp.get(remote_file, str(local_file))
+            with open(local_file, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                sftp.getfo(remote_file, f)
             logger.info(f"Download complete: {local_file}")
             
-            sftp.close()
-            transport.close()
-            
             return str(local_file)
         
+        except ImportError:
+            return None
         except Exception as e:
             logger.error(f"SFTP download failed: {e}")
+            # Drop a possibly broken channel so the next call reopens it
+            self._drop_client()
             return None
     
     def list_remote_files(self) -> list:
@@ -118,28 +205,13 @@ class SFTPTaxRollProcessor:
             List of filenames on remote server
         """
         try:
-            import paramiko
+            return self._connect().listdir(self.config['remote_path'])
+        
         except ImportError:
-            logger.error("paramiko not installed. Install with: pip install paramiko")
             return []
-        
-        try:
-            transport = paramiko.Transport((self.config['sftp_host'], 22))
-            transport.connect(
-                username=self.config['sftp_user'],
-                password=self.config['sftp_password']
-            )
-            
-            sftp = paramiko.SFTPClient.from_transport(transport)
-            files = sftp.listdir(self.config['remote_path'])
-            
-            sftp.close()
-            transport.close()
-            
-            return files
-        
         except Exception as e:
             logger.error(f"Failed to list remote files: {e}")
+            self._drop_client()
             return []
     
     def convert_file(self, input_file: str, output_file: str) -> Optional[int]:
@@ -154,22 +226,122 @@ class SFTPTaxRollProcessor:
             Number of records converted, or None if failed
         """
         try:
-            # Load schema
-            self.schema = load_schema(self.config['schema_file'])
+            # Parse and convert; the schema is loaded once per processor
+            parser = self._get_parser()
+            rows = parser.iter_rows(input_file)
             
-            # Parse and convert
-            parser = FixedWidthParser(self.schema)
-            records = parser.parse_file(input_file)
+            # Save output, streaming rows as they are parsed
+            record_count = save_to_csv(rows, output_file, header=parser.header,
+                                       format_row=parser.format_csv_row)
             
-            # Save output
-            save_to_csv(records, output_file)
+            logger.info(f"Conversion complete: {output_file} ({record_count} records)")
+            return record_count
+        
+        except Exception as e:
+            logger.error(f"Conversion failed: {e}")
+            return None
+    
+    def download_and_convert(self, remote_filename: str, output_file: str) -> Optional[int]:
+        """
+        Download a file and convert it to CSV while it is still arriving.
+        
+        A background thread streams the download both to the local copy
+        and into a pipe; this thread parses from the pipe, so download
+        and parse overlap instead of running one after the other.
+        
+        Args:
+            remote_filename: Name of file on SFTP server
+            output_file: Path to output CSV file
             
-            logger.info(f"Conversion complete: {output_file} ({len(records)} records)")
-            return len(records)
+        Returns:
+            Number of records converted, or None if failed
+        """
+        local_path = Path(self.config['local_path'])
+        local_path.mkdir(parents=True, exist_ok=True)
+        
+        local_file = local_path / remote_filename
+        remote_file = f"{self.config['remote_path'].rstrip('/')}/{remote_filename}"
+        
+        try:
+            parser = self._get_parser()
+        except Exception as e:
+            logger.error(f"Conversion failed: {e}")
+            return None
         
+        try:
+            sftp = self._connect()
+        except ImportError:
+            return None
         except Exception as e:
+            logger.error(f"SFTP download failed: {e}")
+            self._drop_client()
+            return None
+        
+        # Both outputs go to temp files and replace earlier copies only once
+        # the whole download has been parsed, so a failure never leaves a
+        # truncated roll or CSV in their place
+        tmp_paths = []
+        try:
+            for directory in (local_path, os.path.dirname(os.path.abspath(output_file))):
+                fd, path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                os.close(fd)
+                tmp_paths.append(path)
+                # mkstemp creates files 0600 and os.replace keeps the mode;
+                # give the roll and CSV the usual permissions
+                os.chmod(path, 0o644)
+            tmp_local, tmp_output = tmp_paths
+            
+            read_fd, write_fd = os.pipe()
+            download_errors = []
+            
+            def download():
+                # The pipe is opened first so the parser sees EOF however
+                # this thread exits, including when the local file can't be
+                # opened
+                try:
+                    with open(write_fd, 'wb', buffering=IO_BUFFER_SIZE) as pipe, \
+                            open(tmp_local, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                        sftp.getfo(remote_file, _TeeWriter(f, pipe))
+                except Exception as e:
+                    download_errors.append(e)
+            
+            logger.info(f"Downloading and converting {remote_file}...")
+            downloader = threading.Thread(target=download, daemon=True)
+            downloader.start()
+            
+            try:
+                with open(read_fd, 'rb', buffering=IO_BUFFER_SIZE) as reader:
+                    record_count = save_to_csv(parser.iter_rows(reader), tmp_output,
+                                               header=parser.header,
+                                               format_row=parser.format_csv_row)
+            except Exception as e:
+                logger.error(f"Conversion failed: {e}")
+                # Closing the pipe above stops the download with a broken pipe
+                downloader.join()
+                return None
+            
+            downloader.join()
+            if download_errors:
+                # The parser saw the pipe close early; its output is incomplete
+                logger.error(f"SFTP download failed: {download_errors[0]}")
+                self._drop_client()
+                return None
+            
+            os.replace(tmp_local, local_file)
+            os.replace(tmp_output, output_file)
+        except OSError as e:
             logger.error(f"Conversion failed: {e}")
             return None
+        finally:
+            for path in tmp_paths:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+        
+        logger.info(f"Download complete: {local_file}")
+        logger.info(f"Conversion complete: {output_file} ({record_count} records)")
+        return record_count
     
     def process_full_roll(self) -> Tuple[bool, str]:
         """
@@ -180,16 +352,11 @@ class SFTPTaxRollProcessor:
         """
         filename = self.config.get('full_roll_filename', 'full_tax_roll.txt')
         
-        # Download
-        local_file = self.download_file(filename)
-        if not local_file:
-            return False, ""
-        
-        # Convert
         date_str = datetime.now().strftime('%Y-%m-%d')
         output_file = f"full_tax_roll_{date_str}.csv"
         
-        records = self.convert_file(local_file, output_file)
+        # Download and convert in one overlapped pass
+        records = self.download_and_convert(filename, output_file)
         if records is None:
             return False, ""
         
@@ -204,20 +371,43 @@ class SFTPTaxRollProcessor:
         """
         filename = self.config.get('delinquent_roll_filename', 'delinquent_roll.txt')
         
-        # Download
-        local_file = self.download_file(filename)
-        if not local_file:
-            return False, ""
-        
-        # Convert
         date_str = datetime.now().strftime('%Y-%m-%d')
         output_file = f"delinquent_roll_{date_str}.csv"
         
-        records = self.convert_file(local_file, output_file)
+        # Download and convert in one overlapped pass
+        records = self.download_and_convert(filename, output_file)
         if records is None:
             return False, ""
         
         return True, output_file
+    
+    def process_all_rolls(self) -> List[Tuple[bool, str]]:
+        """
+        Download and convert the full and delinquent rolls concurrently.
+        
+        The downloads are network-bound, so running them side by side on
+        the shared connection overlaps their transfer time.
+        
+        Returns:
+            [(success, output_file) for the full roll,
+             (success, output_file) for the delinquent roll]
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            full = executor.submit(self.process_full_roll)
+            delinquent = executor.submit(self.process_delinquent_roll)
+            return [full.result(), delinquent.result()]
+
+
+class _TeeWriter:
+    """File-like sink that writes every chunk to several files."""
+    
+    def __init__(self, *files):
+        self._files = files
+    
+    def write(self, data: bytes) -> int:
+        for f in self._files:
+            f.write(data)
+        return len(data)
 
 
 # =============================================================================
@@ -251,9 +441,9 @@ def create_sample_config():
 def example_list_files():
     """List available files on SFTP server."""
     print("Connecting to SFTP server...")
-    processor = SFTPTaxRollProcessor('sftp_config.json')
+    with SFTPTaxRollProcessor('sftp_config.json') as processor:
+        files = processor.list_remote_files()
     
-    files = processor.list_remote_files()
     print(f"\nAvailable files on server:")
     for file in files:
         print(f"  - {file}")
@@ -263,48 +453,47 @@ def example_download_and_convert():
     """Download and convert both rolls."""
     print("Starting tax roll processing...")
     
-    processor = SFTPTaxRollProcessor('sftp_config.json')
+    # Both rolls download concurrently over one SFTP connection
+    with SFTPTaxRollProcessor('sftp_config.json') as processor:
+        results = processor.process_all_rolls()
     
-    # Process full roll
-    print("\n1. Processing full tax roll...")
-    success, output = processor.process_full_roll()
-    if success:
-        print(f"   ✓ Success: {output}")
-    else:
-        print(f"   ✗ Failed")
-    
-    # Process delinquent roll
-    print("\n2. Processing delinquent roll...")
-    success, output = processor.process_delinquent_roll()
-    if success:
-        print(f"   ✓ Success: {output}")
-    else:
-        print(f"   ✗ Failed")
+    labels = ["1. Full tax roll", "2. Delinquent roll"]
+    for label, (success, output) in zip(labels, results):
+        print(f"\n{label}:")
+        if success:
+            print(f"   ✓ Success: {output}")
+        else:
+            print(f"   ✗ Failed")
 
 
 def example_custom_processing():
     """Download and perform custom processing."""
-    processor = SFTPTaxRollProcessor('sftp_config.json')
-    
-    # List available files
-    files = processor.list_remote_files()
-    
-    # Process specific file
-    if 'tax_roll_2024.txt' in files:
-        local_file = processor.download_file('tax_roll_2024.txt')
-        
-        if local_file:
-            # Custom conversion with filtering
-            schema = load_schema('schema.json')
-            parser = FixedWidthParser(schema)
-            
-            records = parser.parse_file(local_file)
-            
-            # Filter: only records with tax > 5000
-            high_value = [r for r in records if r.get('Tax_Amount', 0) > 5000]
+    with SFTPTaxRollProcessor('sftp_config.json') as processor:
+        # List available files
+        files = processor.list_remote_files()
+        
+        # Process specific file
+        if 'tax_roll_2024.txt' in files:
+            local_file = processor.download_file('tax_roll_2024.txt')
             
-            save_to_csv(high_value, 'high_value_properties.csv')
-            print(f"Processed {len(high_value)} high-value properties")
+            if local_file:
+                # Custom conversion with filtering
+                schema = load_schema('schema.json')
+                parser = FixedWidthParser(schema)
+                tax_idx = parser.header.index('Tax_Amount')
+                
+                # Filter while parsing: only records with tax > 5000 are kept
+                # (missing or unparseable amounts are skipped)
+                def is_high_value(row):
+                    tax = row[tax_idx]
+                    return isinstance(tax, (int, float)) and tax > 5000
+                
+                high_value = parser.iter_rows(local_file, where=is_high_value)
+                
+                count = save_to_csv(high_value, 'high_value_properties.csv',
+                                    header=parser.header,
+                                    format_row=parser.format_csv_row)
+                print(f"Processed {count} high-value properties")
 
 
 # =============================================================================
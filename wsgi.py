@@ -0,0 +1,10 @@
+"""
+WSGI entry point for the Tax Roll Converter web app.
+
+Usage:
+    gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+from app import app
+
+__all__ = ['app']